@@ -2,53 +2,104 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from functools import partial
+from pathlib import Path
 from typing import Any
 
-import cloudinary
-import cloudinary.uploader
 import voluptuous as vol
 
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import (
+    CONF_WEBHOOK_ID,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DESTINATIONS,
+    ATTR_EAGER,
     ATTR_FILE_PATH,
     ATTR_PUBLIC_ID,
+    ATTR_TIMEOUT,
     CONF_API_KEY,
     CONF_API_SECRET,
     CONF_CLOUD_NAME,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_MIN_CONCURRENCY,
+    CONF_UPLOAD_TIMEOUT,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MIN_CONCURRENCY,
+    DEFAULT_UPLOAD_TIMEOUT,
     DOMAIN,
+    DRAIN_TIMEOUT,
     SERVICE_UPLOAD_IMAGE,
 )
+from .uploader import CloudinaryUploader
 
 _LOGGER = logging.getLogger(__name__)
 
-UPLOAD_SCHEMA = vol.Schema(
+PLATFORMS: list[Platform] = [Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+DESTINATION_SCHEMA = vol.Schema(
     {
-        vol.Required(ATTR_FILE_PATH): cv.string,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
         vol.Required(ATTR_PUBLIC_ID): cv.string,
     }
 )
 
+UPLOAD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_FILE_PATH): cv.string,
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Exclusive(ATTR_PUBLIC_ID, "destination"): cv.string,
+            vol.Exclusive(ATTR_DESTINATIONS, "destination"): vol.All(
+                cv.ensure_list, [DESTINATION_SCHEMA], vol.Length(min=1)
+            ),
+            vol.Optional(ATTR_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=1)
+            ),
+            vol.Optional(ATTR_EAGER): vol.All(
+                cv.ensure_list, [cv.string], vol.Length(min=1)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_PUBLIC_ID, ATTR_DESTINATIONS),
+)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Cloudinary Uploader from a config entry."""
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Cloudinary Uploader service.
+
+    The service is shared by all config entries, so it is registered once
+    here rather than per entry.
+    """
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        CONF_CLOUD_NAME: entry.data[CONF_CLOUD_NAME],
-        CONF_API_KEY: entry.data[CONF_API_KEY],
-        CONF_API_SECRET: entry.data[CONF_API_SECRET],
-    }
 
-    async def async_handle_upload(call: ServiceCall) -> None:
+    async def async_handle_upload(call: ServiceCall) -> ServiceResponse:
         """Handle the upload_image service call."""
         file_path: str = call.data[ATTR_FILE_PATH]
-        public_id: str = call.data[ATTR_PUBLIC_ID]
+        timeout: float | None = call.data.get(ATTR_TIMEOUT)
+        eager: list[str] | None = call.data.get(ATTR_EAGER)
 
         if not hass.config.is_allowed_path(file_path):
             raise ServiceValidationError(
@@ -67,27 +118,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 translation_placeholders={"file_path": file_path},
             )
 
-        config = hass.data[DOMAIN][entry.entry_id]
-
-        try:
-            result: dict[str, Any] = await hass.async_add_executor_job(
-                partial(
-                    _upload_to_cloudinary,
-                    cloud_name=config[CONF_CLOUD_NAME],
-                    api_key=config[CONF_API_KEY],
-                    api_secret=config[CONF_API_SECRET],
-                    file_path=file_path,
-                    public_id=public_id,
+        entry_id: str | None = call.data.get(ATTR_CONFIG_ENTRY_ID)
+
+        if ATTR_DESTINATIONS in call.data:
+            return {
+                "results": await _async_upload_to_destinations(
+                    hass,
+                    file_path,
+                    call.data[ATTR_DESTINATIONS],
+                    entry_id,
+                    timeout,
+                    eager,
                 )
-            )
-        except cloudinary.exceptions.Error as err:
-            raise HomeAssistantError(
-                f"Cloudinary upload failed: {err}"
-            ) from err
-        except OSError as err:
-            raise HomeAssistantError(
-                f"Failed to read file '{file_path}': {err}"
-            ) from err
+            }
+
+        public_id: str = call.data[ATTR_PUBLIC_ID]
+        uploader = _get_uploader(hass, entry_id)
+        result = await uploader.async_upload(
+            file_path, public_id, timeout, eager=eager
+        )
 
         _LOGGER.debug(
             "Uploaded '%s' to Cloudinary as '%s' (url: %s)",
@@ -95,41 +144,203 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             public_id,
             result.get("secure_url"),
         )
+        return {
+            "results": [
+                {
+                    ATTR_CONFIG_ENTRY_ID: uploader.entry_id,
+                    ATTR_PUBLIC_ID: public_id,
+                    "secure_url": result.get("secure_url"),
+                }
+            ]
+        }
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_UPLOAD_IMAGE,
         async_handle_upload,
         schema=UPLOAD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Cloudinary Uploader from a config entry."""
+    if CONF_WEBHOOK_ID not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()},
+        )
+
+    uploader = CloudinaryUploader(
+        hass,
+        entry_id=entry.entry_id,
+        webhook_id=entry.data[CONF_WEBHOOK_ID],
+        cloud_name=entry.data[CONF_CLOUD_NAME],
+        api_key=entry.data[CONF_API_KEY],
+        api_secret=entry.data[CONF_API_SECRET],
+        upload_timeout=entry.options.get(
+            CONF_UPLOAD_TIMEOUT, DEFAULT_UPLOAD_TIMEOUT
+        ),
+        keepalive_interval=entry.options.get(
+            CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL
+        ),
+        min_concurrency=int(
+            entry.options.get(CONF_MIN_CONCURRENCY, DEFAULT_MIN_CONCURRENCY)
+        ),
+        max_concurrency=int(
+            entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        ),
+    )
+    hass.data[DOMAIN][entry.entry_id] = uploader
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        uploader.webhook_id,
+        uploader.async_handle_webhook,
+        allowed_methods=["POST"],
+    )
+    entry.async_on_unload(
+        partial(webhook.async_unregister, hass, uploader.webhook_id)
     )
 
+    async def _async_drain_on_stop(event: Event) -> None:
+        """Let in-flight uploads finish before Home Assistant stops."""
+        await uploader.async_drain(DRAIN_TIMEOUT)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_drain_on_stop)
+    )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    uploader.async_start()
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    hass.services.async_remove(DOMAIN, SERVICE_UPLOAD_IMAGE)
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+    # Drain only once unloading can no longer fail, as it closes the uploader
+    # for good.
+    uploader: CloudinaryUploader = hass.data[DOMAIN][entry.entry_id]
+    await uploader.async_drain(DRAIN_TIMEOUT)
     hass.data[DOMAIN].pop(entry.entry_id)
     return True
 
 
-def _upload_to_cloudinary(
-    *,
-    cloud_name: str,
-    api_key: str,
-    api_secret: str,
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _get_uploader(hass: HomeAssistant, entry_id: str | None) -> CloudinaryUploader:
+    """Return the uploader of a loaded config entry.
+
+    Without an entry ID the only loaded entry is used; with several
+    accounts loaded the caller has to pick one.
+    """
+    uploaders: dict[str, CloudinaryUploader] = hass.data[DOMAIN]
+    if entry_id is None:
+        if len(uploaders) == 1:
+            return next(iter(uploaders.values()))
+        if not uploaders:
+            raise ServiceValidationError(
+                "No Cloudinary account is loaded",
+                translation_domain=DOMAIN,
+                translation_key="no_entry_loaded",
+            )
+        raise ServiceValidationError(
+            "Several Cloudinary accounts are loaded; set config_entry_id",
+            translation_domain=DOMAIN,
+            translation_key="config_entry_required",
+        )
+    if (uploader := uploaders.get(entry_id)) is None:
+        raise ServiceValidationError(
+            f"Config entry '{entry_id}' is not loaded",
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"config_entry_id": entry_id},
+        )
+    return uploader
+
+
+async def _async_upload_to_destinations(
+    hass: HomeAssistant,
     file_path: str,
-    public_id: str,
-) -> dict[str, Any]:
-    """Upload a file to Cloudinary (runs in executor)."""
-    cloudinary.config(
-        cloud_name=cloud_name,
-        api_key=api_key,
-        api_secret=api_secret,
+    destinations: list[dict[str, str]],
+    default_entry_id: str | None,
+    timeout: float | None,
+    eager: list[str] | None,
+) -> list[dict[str, Any]]:
+    """Read a file once and upload it to several destinations concurrently.
+
+    Destinations without a config_entry_id use ``default_entry_id``, which
+    may itself be omitted when only one entry is loaded. Failures are
+    reported per destination; an error is raised only if all of them failed.
+    """
+    uploaders = [
+        _get_uploader(
+            hass, destination.get(ATTR_CONFIG_ENTRY_ID, default_entry_id)
+        )
+        for destination in destinations
+    ]
+
+    try:
+        data = await hass.async_add_executor_job(Path(file_path).read_bytes)
+    except OSError as err:
+        raise HomeAssistantError(
+            f"Failed to read file '{file_path}': {err}"
+        ) from err
+
+    outcomes = await asyncio.gather(
+        *(
+            uploader.async_upload(
+                file_path,
+                destination[ATTR_PUBLIC_ID],
+                timeout,
+                data=data,
+                eager=eager,
+            )
+            for uploader, destination in zip(uploaders, destinations)
+        ),
+        return_exceptions=True,
     )
-    return cloudinary.uploader.upload(
+
+    results: list[dict[str, Any]] = []
+    for uploader, destination, outcome in zip(uploaders, destinations, outcomes):
+        result: dict[str, Any] = {
+            ATTR_CONFIG_ENTRY_ID: uploader.entry_id,
+            ATTR_PUBLIC_ID: destination[ATTR_PUBLIC_ID],
+        }
+        if isinstance(outcome, HomeAssistantError):
+            _LOGGER.warning(
+                "Upload of '%s' to '%s' as '%s' failed: %s",
+                file_path,
+                uploader.cloud_name,
+                destination[ATTR_PUBLIC_ID],
+                outcome,
+            )
+            result["error"] = str(outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            result["secure_url"] = outcome.get("secure_url")
+        results.append(result)
+
+    if all("error" in result for result in results):
+        raise HomeAssistantError(
+            f"Upload of '{file_path}' failed for all {len(results)} destinations"
+        )
+
+    _LOGGER.debug(
+        "Uploaded '%s' to %d of %d destinations",
         file_path,
-        public_id=public_id,
-        overwrite=True,
-        resource_type="image",
+        sum("error" not in result for result in results),
+        len(results),
     )
+    return results
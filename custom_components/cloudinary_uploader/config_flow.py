@@ -10,10 +10,25 @@ import cloudinary
 import cloudinary.api
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import CONF_API_KEY, CONF_API_SECRET, CONF_CLOUD_NAME, DOMAIN
+from .const import (
+    CONF_API_KEY,
+    CONF_API_SECRET,
+    CONF_CLOUD_NAME,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_MIN_CONCURRENCY,
+    CONF_UPLOAD_TIMEOUT,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MIN_CONCURRENCY,
+    DEFAULT_UPLOAD_TIMEOUT,
+    DOMAIN,
+    MIN_KEEPALIVE_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,6 +58,12 @@ class CloudinaryUploaderConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return CloudinaryUploaderOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -79,3 +100,57 @@ class CloudinaryUploaderConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=DATA_SCHEMA,
             errors=errors,
         )
+
+
+class CloudinaryUploaderOptionsFlow(OptionsFlow):
+    """Handle Cloudinary Uploader options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the upload options."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if 0 < user_input[CONF_KEEPALIVE_INTERVAL] < MIN_KEEPALIVE_INTERVAL:
+                errors[CONF_KEEPALIVE_INTERVAL] = "keepalive_interval_too_short"
+            if user_input[CONF_MIN_CONCURRENCY] > user_input[CONF_MAX_CONCURRENCY]:
+                errors["base"] = "invalid_concurrency_bounds"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        entry = self.hass.config_entries.async_get_entry(self.handler)
+        options = entry.options if entry is not None else {}
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPLOAD_TIMEOUT,
+                        default=options.get(
+                            CONF_UPLOAD_TIMEOUT, DEFAULT_UPLOAD_TIMEOUT
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_KEEPALIVE_INTERVAL,
+                        default=options.get(
+                            CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_MIN_CONCURRENCY,
+                        default=options.get(
+                            CONF_MIN_CONCURRENCY, DEFAULT_MIN_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Required(
+                        CONF_MAX_CONCURRENCY,
+                        default=options.get(
+                            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                }
+            ),
+            errors=errors,
+        )
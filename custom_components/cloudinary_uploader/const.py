@@ -5,8 +5,46 @@ DOMAIN = "cloudinary_uploader"
 CONF_CLOUD_NAME = "cloud_name"
 CONF_API_KEY = "api_key"
 CONF_API_SECRET = "api_secret"
+CONF_UPLOAD_TIMEOUT = "upload_timeout"
+CONF_KEEPALIVE_INTERVAL = "keepalive_interval"
+CONF_MIN_CONCURRENCY = "min_concurrency"
+CONF_MAX_CONCURRENCY = "max_concurrency"
 
 SERVICE_UPLOAD_IMAGE = "upload_image"
 
+EVENT_EAGER_COMPLETE = f"{DOMAIN}_eager_complete"
+
+# hass.data key for the keep-alive shared by all entries.
+DATA_CONNECTION_KEEPER = f"{DOMAIN}_connection_keeper"
+
 ATTR_FILE_PATH = "file_path"
 ATTR_PUBLIC_ID = "public_id"
+ATTR_TIMEOUT = "timeout"
+ATTR_DESTINATIONS = "destinations"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_EAGER = "eager"
+
+DEFAULT_UPLOAD_TIMEOUT = 60
+
+# Refresh the pooled connection before typical load balancer idle timeouts
+# (60 seconds) close it. 0 disables warm-up and keep-alive; anything else
+# must be at least MIN_KEEPALIVE_INTERVAL to avoid hammering the API.
+DEFAULT_KEEPALIVE_INTERVAL = 45
+MIN_KEEPALIVE_INTERVAL = 10
+
+# Bounds and starting point for the adaptive number of parallel uploads.
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 8
+INITIAL_CONCURRENCY = 4
+
+# Seconds to wait for a keep-alive request.
+KEEPALIVE_TIMEOUT = 10
+
+# Seconds to let in-flight uploads finish on unload / shutdown before aborting.
+DRAIN_TIMEOUT = 10
+
+# Eager notifications older than this are rejected, as in the Cloudinary SDK.
+NOTIFICATION_MAX_AGE = 7200
+
+# Number of public IDs whose derived URLs are kept in memory per entry.
+DERIVED_HISTORY_SIZE = 256
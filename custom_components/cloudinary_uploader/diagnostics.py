@@ -0,0 +1,32 @@
+"""Diagnostics support for Cloudinary Uploader."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, CONF_API_SECRET, DOMAIN
+from .uploader import CloudinaryUploader
+
+TO_REDACT = {CONF_API_KEY, CONF_API_SECRET, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    uploader: CloudinaryUploader = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "connection": {
+            "keepalive_interval": uploader.keepalive_interval,
+            "cold_connects": uploader.cold_connects,
+            "warm_connects": uploader.warm_connects,
+            "keepalive_pings": uploader.keepalive_pings,
+        },
+        "derived": uploader.derived,
+    }
@@ -0,0 +1,133 @@
+"""Adaptive concurrency limit for Cloudinary uploads."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import math
+import time
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+# A successful upload slower than this multiple of the baseline latency
+# means requests are queueing somewhere; back off gently.
+LATENCY_TOLERANCE = 2.0
+LATENCY_BACKOFF = 0.9
+
+# Throttling, server errors and timeouts halve the limit.
+CONGESTION_BACKOFF = 0.5
+
+# Let the baseline creep up so a slower link (e.g. LTE failover) is relearned.
+BASELINE_DRIFT = 1.05
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limit concurrent uploads with AIMD on latency and error signals.
+
+    The limit grows by one per round of uploads that ran at full
+    concurrency with normal latency, and shrinks multiplicatively on
+    congestion. It is always clamped to ``[min_limit, max_limit]``. At most
+    one decrease is applied per round: failures of uploads that started
+    before the last decrease are not counted again.
+    """
+
+    def __init__(self, min_limit: int, max_limit: int, initial_limit: int) -> None:
+        """Initialize the limiter."""
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self._baseline: float | None = None
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def current_limit(self) -> int:
+        """Return the number of uploads currently allowed to run at once."""
+        return math.floor(self.limit)
+
+    async def async_acquire(self) -> float:
+        """Wait for a free slot and return the time the upload started."""
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we were cancelled.
+                self.in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return time.monotonic()
+
+    @callback
+    def release(
+        self,
+        started: float,
+        *,
+        latency: float | None = None,
+        congested: bool = False,
+    ) -> None:
+        """Free a slot and feed the outcome of the upload into the limit.
+
+        Pass ``latency`` for a successful upload and ``congested`` for one
+        that was throttled, hit a server error or timed out. Anything else
+        (e.g. an invalid file) leaves the limit unchanged.
+        """
+        previous = self.current_limit
+        if congested:
+            self._decrease(started, CONGESTION_BACKOFF)
+        elif latency is not None:
+            self._on_success(started, latency)
+        self.in_flight -= 1
+        self._wake_waiters()
+
+        if self.current_limit != previous:
+            for listener in list(self._listeners):
+                listener()
+
+    @callback
+    def async_add_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call ``listener`` whenever the current limit changes."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _on_success(self, started: float, latency: float) -> None:
+        """Grow the limit, unless the upload was unusually slow."""
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            self._baseline = min(latency, self._baseline * BASELINE_DRIFT)
+
+        if latency > self._baseline * LATENCY_TOLERANCE:
+            self._decrease(started, LATENCY_BACKOFF)
+        elif self.in_flight >= self.current_limit:
+            # Only grow while the limit is actually the bottleneck.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _decrease(self, started: float, factor: float) -> None:
+        """Shrink the limit once per round of uploads."""
+        if started < self._last_decrease:
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._last_decrease = time.monotonic()
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to waiting uploads in arrival order."""
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
@@ -0,0 +1,59 @@
+"""Sensor platform for Cloudinary Uploader."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .uploader import CloudinaryUploader
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Cloudinary Uploader sensors."""
+    uploader: CloudinaryUploader = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([ConcurrencyLimitSensor(entry, uploader)])
+
+
+class ConcurrencyLimitSensor(SensorEntity):
+    """Current adaptive limit on parallel uploads."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "concurrency_limit"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_should_poll = False
+
+    def __init__(self, entry: ConfigEntry, uploader: CloudinaryUploader) -> None:
+        """Initialize the sensor."""
+        self._limiter = uploader.limiter
+        self._attr_unique_id = f"{entry.entry_id}_concurrency_limit"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Cloudinary",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._attr_extra_state_attributes = {
+            "min_limit": self._limiter.min_limit,
+            "max_limit": self._limiter.max_limit,
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow changes of the limit."""
+        self.async_on_remove(
+            self._limiter.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the current limit."""
+        return self._limiter.current_limit
@@ -0,0 +1,525 @@
+"""Per-entry Cloudinary upload client."""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import logging
+import time
+from functools import partial
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+import cloudinary
+import cloudinary.uploader
+import cloudinary.utils
+from urllib3.exceptions import HTTPError
+
+from homeassistant.components import webhook
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_PUBLIC_ID,
+    DATA_CONNECTION_KEEPER,
+    DERIVED_HISTORY_SIZE,
+    DOMAIN,
+    EVENT_EAGER_COMPLETE,
+    INITIAL_CONCURRENCY,
+    KEEPALIVE_TIMEOUT,
+    NOTIFICATION_MAX_AGE,
+)
+from .limiter import AdaptiveConcurrencyLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CloudinaryUploader:
+    """Run uploads for a single Cloudinary account.
+
+    Every upload is bounded by a timeout, both on the asyncio side and at the
+    socket level inside the SDK, so a hung connection cannot pin an executor
+    thread indefinitely. In-flight uploads are tracked so they can be drained
+    when the config entry is unloaded or Home Assistant stops.
+
+    Eager transformations are generated asynchronously by Cloudinary, which
+    reports completion to this entry's webhook. The derived URLs of the most
+    recent uploads are kept in ``derived``.
+
+    With a keep-alive interval set, the uploader joins the shared
+    UploadConnectionKeeper, which keeps a pooled
+    connection warm so uploads skip DNS, TCP and TLS setup.
+    ``cold_connects`` and ``warm_connects`` count uploads that did and did
+    not need a new connection.
+
+    The number of uploads running at once is set by ``limiter``, which
+    adapts to observed latency, throttling and server errors.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        entry_id: str,
+        webhook_id: str,
+        cloud_name: str,
+        api_key: str,
+        api_secret: str,
+        upload_timeout: float,
+        keepalive_interval: float,
+        min_concurrency: int,
+        max_concurrency: int,
+    ) -> None:
+        """Initialize the uploader."""
+        self._hass = hass
+        self.entry_id = entry_id
+        self.webhook_id = webhook_id
+        self.cloud_name = cloud_name
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.upload_timeout = upload_timeout
+        self.keepalive_interval = keepalive_interval
+        self.derived: dict[str, list[dict[str, Any]]] = {}
+        self.cold_connects = 0
+        self.warm_connects = 0
+        self.limiter = AdaptiveConcurrencyLimiter(
+            min_concurrency, max_concurrency, INITIAL_CONCURRENCY
+        )
+        self._pending: dict[
+            asyncio.Future[tuple[dict[str, Any], bool]], str
+        ] = {}
+        self._closing = False
+        self._keeper: UploadConnectionKeeper | None = None
+        self._unsub_keeper: CALLBACK_TYPE | None = None
+
+    @property
+    def keepalive_pings(self) -> int:
+        """Return the keep-alive requests sent to the upload API."""
+        return self._keeper.pings if self._keeper is not None else 0
+
+    @callback
+    def async_start(self) -> None:
+        """Open a warm connection and start keeping it alive."""
+        if not self.keepalive_interval:
+            return
+        if (keeper := self._hass.data.get(DATA_CONNECTION_KEEPER)) is None:
+            keeper = self._hass.data[DATA_CONNECTION_KEEPER] = (
+                UploadConnectionKeeper(self._hass)
+            )
+        self._keeper = keeper
+        self._unsub_keeper = keeper.async_add_client(
+            self.entry_id, self.cloud_name, self.keepalive_interval
+        )
+
+    async def async_upload(
+        self,
+        file_path: str,
+        public_id: str,
+        timeout: float | None = None,
+        *,
+        data: bytes | None = None,
+        eager: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Upload a file and return the Cloudinary response.
+
+        If ``data`` is given it is uploaded instead of reading ``file_path``,
+        which is then only used as the file name. ``eager`` transformations
+        are requested asynchronously; see async_handle_webhook.
+        """
+        if self._closing:
+            raise HomeAssistantError(
+                f"Upload of '{file_path}' rejected: integration is shutting down",
+                translation_domain=DOMAIN,
+                translation_key="upload_aborted",
+                translation_placeholders={"file_path": file_path},
+            )
+
+        if timeout is None:
+            timeout = self.upload_timeout
+
+        options: dict[str, Any] = {}
+        if eager:
+            # webhook.async_generate_url falls back to the internal URL,
+            # which Cloudinary cannot reach.
+            try:
+                notification_url = get_url(
+                    self._hass, allow_internal=False, prefer_external=True
+                ) + webhook.async_generate_path(self.webhook_id)
+            except NoURLAvailableError as err:
+                raise ServiceValidationError(
+                    "Eager transformations need a Home Assistant URL that "
+                    "Cloudinary can reach. Configure an external URL.",
+                    translation_domain=DOMAIN,
+                    translation_key="no_webhook_url",
+                ) from err
+            options.update(
+                eager=eager,
+                eager_async=True,
+                eager_notification_url=notification_url,
+            )
+
+        started: float | None = None
+        latency: float | None = None
+        congested = False
+        loop = asyncio.get_running_loop()
+        try:
+            async with asyncio.timeout(timeout) as scope:
+                started = await self.limiter.async_acquire()
+                if self._closing:
+                    # Drained while waiting for a slot; handled as an abort.
+                    raise asyncio.CancelledError
+                # Time spent waiting for a slot counts against the timeout, so
+                # the socket only gets what is left; otherwise an abandoned
+                # upload could hold its executor thread for another full
+                # timeout.
+                if (remaining := scope.when() - loop.time()) <= 0:
+                    raise TimeoutError
+                future = self._hass.async_add_executor_job(
+                    partial(
+                        _upload_to_cloudinary,
+                        cloud_name=self.cloud_name,
+                        api_key=self.api_key,
+                        api_secret=self.api_secret,
+                        file_path=file_path,
+                        data=data,
+                        public_id=public_id,
+                        timeout=remaining,
+                        **options,
+                    )
+                )
+                self._pending[future] = file_path
+                future.add_done_callback(self._discard_pending)
+                result, cold = await future
+                latency = time.monotonic() - started
+        except TimeoutError as err:
+            congested = started is not None
+            raise HomeAssistantError(
+                f"Upload of '{file_path}' timed out after {timeout} seconds",
+                translation_domain=DOMAIN,
+                translation_key="upload_timeout",
+                translation_placeholders={
+                    "file_path": file_path,
+                    "timeout": str(timeout),
+                },
+            ) from err
+        except asyncio.CancelledError:
+            # Distinguish an abort from async_drain from the caller itself
+            # being cancelled; only the former becomes a service error.
+            task = asyncio.current_task()
+            if self._closing and (task is None or not task.cancelling()):
+                raise HomeAssistantError(
+                    f"Upload of '{file_path}' aborted: integration is shutting down",
+                    translation_domain=DOMAIN,
+                    translation_key="upload_aborted",
+                    translation_placeholders={"file_path": file_path},
+                ) from None
+            raise
+        except cloudinary.exceptions.Error as err:
+            congested = _is_congestion(err)
+            raise HomeAssistantError(
+                f"Cloudinary upload failed: {err}"
+            ) from err
+        except OSError as err:
+            raise HomeAssistantError(
+                f"Failed to read file '{file_path}': {err}"
+            ) from err
+        finally:
+            if started is not None:
+                self.limiter.release(started, latency=latency, congested=congested)
+
+        if cold:
+            self.cold_connects += 1
+        else:
+            self.warm_connects += 1
+        if self._keeper is not None:
+            self._keeper.async_touch()
+        return result
+
+    async def async_drain(self, timeout: float) -> None:
+        """Stop accepting uploads and let in-flight ones finish.
+
+        Uploads still running after ``timeout`` seconds are aborted; their
+        callers receive an error and the executor threads are released once
+        the SDK's socket timeout expires.
+        """
+        self._closing = True
+        if self._unsub_keeper is not None:
+            self._unsub_keeper()
+            self._unsub_keeper = None
+        if not self._pending:
+            return
+
+        _LOGGER.debug(
+            "Waiting up to %s seconds for %d in-flight upload(s) to finish",
+            timeout,
+            len(self._pending),
+        )
+        _, still_running = await asyncio.wait(set(self._pending), timeout=timeout)
+        for future in still_running:
+            _LOGGER.warning(
+                "Aborting upload of '%s': did not finish within %s seconds",
+                self._pending.get(future),
+                timeout,
+            )
+            future.cancel()
+
+    async def async_handle_webhook(
+        self, hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response | None:
+        """Handle an eager transformation notification from Cloudinary."""
+        body = await request.text()
+        if not self._verify_notification(
+            body,
+            request.headers.get("X-Cld-Timestamp", ""),
+            request.headers.get("X-Cld-Signature", ""),
+        ):
+            _LOGGER.warning(
+                "Rejected Cloudinary notification with an invalid signature"
+            )
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        try:
+            payload: dict[str, Any] = json.loads(body)
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        if payload.get("notification_type") != "eager":
+            return None
+
+        public_id: str = payload.get(ATTR_PUBLIC_ID, "")
+        derived = [
+            {
+                "transformation": item.get("transformation"),
+                "secure_url": item.get("secure_url"),
+                "width": item.get("width"),
+                "height": item.get("height"),
+            }
+            for item in payload.get("eager", [])
+        ]
+
+        # Keep only the most recent uploads; re-inserting moves an updated
+        # public ID to the end.
+        self.derived.pop(public_id, None)
+        self.derived[public_id] = derived
+        while len(self.derived) > DERIVED_HISTORY_SIZE:
+            del self.derived[next(iter(self.derived))]
+
+        _LOGGER.debug(
+            "Eager transformations ready for '%s': %s",
+            public_id,
+            [item["secure_url"] for item in derived],
+        )
+        hass.bus.async_fire(
+            EVENT_EAGER_COMPLETE,
+            {
+                ATTR_CONFIG_ENTRY_ID: self.entry_id,
+                ATTR_PUBLIC_ID: public_id,
+                "derived": derived,
+            },
+        )
+        return None
+
+    def _verify_notification(
+        self, body: str, timestamp: str, signature: str
+    ) -> bool:
+        """Check the signature Cloudinary puts on its notifications."""
+        try:
+            if int(timestamp) < time.time() - NOTIFICATION_MAX_AGE:
+                return False
+        except ValueError:
+            return False
+        expected = cloudinary.utils.compute_hex_hash(
+            f"{body}{timestamp}{self.api_secret}",
+            cloudinary.config().signature_algorithm,
+        )
+        return hmac.compare_digest(expected, signature)
+
+    def _discard_pending(
+        self, future: asyncio.Future[tuple[dict[str, Any], bool]]
+    ) -> None:
+        """Forget a finished upload."""
+        self._pending.pop(future, None)
+
+
+class UploadConnectionKeeper:
+    """Keep the pooled connection to the upload API warm.
+
+    The SDK sends the uploads of every account to the host set by its global
+    upload_prefix, through one module-level urllib3 pool that keeps a single
+    idle connection per host. All entries therefore share one keeper and one
+    timer: it opens the connection when the first entry starts and refreshes
+    it once it has been idle for the shortest interval any entry asked for.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the keeper."""
+        self._hass = hass
+        self.pings = 0
+        self._clients: dict[str, tuple[str, float]] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def interval(self) -> float:
+        """Return the shortest keep-alive interval of the current clients."""
+        return min(
+            (interval for _, interval in self._clients.values()), default=0
+        )
+
+    @callback
+    def async_add_client(
+        self, entry_id: str, cloud_name: str, interval: float
+    ) -> CALLBACK_TYPE:
+        """Keep the connection warm for an entry until the callback is called."""
+        self._clients[entry_id] = (cloud_name, interval)
+        if self._task is None:
+            self._async_keep_alive()
+        else:
+            self.async_touch()
+
+        @callback
+        def remove_client() -> None:
+            self._clients.pop(entry_id, None)
+            if self._clients:
+                # The shortest interval may have changed.
+                self.async_touch()
+                return
+            self._async_cancel_timer()
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+            if self._hass.data.get(DATA_CONNECTION_KEEPER) is self:
+                del self._hass.data[DATA_CONNECTION_KEEPER]
+
+        return remove_client
+
+    @callback
+    def async_touch(self) -> None:
+        """Ping once the connection has been idle for the keep-alive interval."""
+        if not self._clients:
+            return
+        self._async_cancel_timer()
+        self._unsub_timer = async_call_later(
+            self._hass, self.interval, self._async_keep_alive
+        )
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        """Cancel the pending keep-alive."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_keep_alive(self, _now: Any = None) -> None:
+        """Refresh the pooled connection in the background."""
+        self._unsub_timer = None
+        if not self._clients or (self._task is not None and not self._task.done()):
+            return
+        self._task = self._hass.async_create_background_task(
+            self._async_ping(), f"{DOMAIN} keep-alive"
+        )
+
+    async def _async_ping(self) -> None:
+        """Send a keep-alive request and schedule the next one."""
+        # Any account works; the request only has to reach the host.
+        cloud_name = next(iter(self._clients.values()))[0]
+        if await self._hass.async_add_executor_job(_ping_upload_api, cloud_name):
+            self.pings += 1
+        self.async_touch()
+
+
+class CloudinaryApiError(cloudinary.exceptions.Error):
+    """Error response from the Cloudinary upload API."""
+
+    def __init__(self, message: str, http_code: int | None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.http_code = http_code
+
+
+def _is_congestion(err: cloudinary.exceptions.Error) -> bool:
+    """Return whether a failed upload should lower the concurrency limit.
+
+    Rate limiting (420/429) and 5xx responses count, as do transport errors
+    without a response.
+    """
+    if not isinstance(err, CloudinaryApiError) or err.http_code is None:
+        return True
+    return err.http_code in (420, 429) or err.http_code >= 500
+
+
+def _upload_to_cloudinary(
+    *,
+    cloud_name: str,
+    api_key: str,
+    api_secret: str,
+    file_path: str,
+    data: bytes | None,
+    public_id: str,
+    timeout: float,
+    **options: Any,
+) -> tuple[dict[str, Any], bool]:
+    """Upload a file to Cloudinary (runs in executor).
+
+    Credentials are passed per call rather than through the global
+    cloudinary.config(), so uploads to different accounts can run
+    concurrently. Also returns whether a new connection was opened; with
+    concurrent uploads this is approximate.
+    """
+    connections = _connections_opened()
+    result = cloudinary.uploader.upload(
+        file_path if data is None else (file_path, data),
+        public_id=public_id,
+        overwrite=True,
+        resource_type="image",
+        timeout=timeout,
+        cloud_name=cloud_name,
+        api_key=api_key,
+        api_secret=api_secret,
+        return_error=True,
+        **options,
+    )
+    if "error" in result:
+        raise CloudinaryApiError(
+            result["error"].get("message", "Unknown error"),
+            result["error"].get("http_code"),
+        )
+    return result, _connections_opened() > connections
+
+
+def _connections_opened() -> int:
+    """Return how many connections the SDK's upload pools have opened.
+
+    The Cloudinary SDK sends every upload through one module-level urllib3
+    PoolManager, so that pool is what warm-up and keep-alive act on.
+    """
+    pools = cloudinary.uploader._http.pools  # noqa: SLF001
+    return sum(
+        pool.num_connections
+        for pool in map(pools.get, pools.keys())
+        if pool is not None
+    )
+
+
+def _ping_upload_api(cloud_name: str) -> bool:
+    """Open or refresh a pooled connection to the upload API (runs in executor).
+
+    An unauthenticated HEAD request is enough to keep the TLS connection
+    alive. Unlike cloudinary.api.ping it does not touch the rate-limited
+    Admin API. The response status is irrelevant.
+    """
+    url = cloudinary.utils.cloudinary_api_url("upload", cloud_name=cloud_name)
+    try:
+        cloudinary.uploader._http.request(  # noqa: SLF001
+            "HEAD", url, retries=False, timeout=KEEPALIVE_TIMEOUT
+        )
+    except (HTTPError, OSError) as err:
+        _LOGGER.debug("Keep-alive request to %s failed: %s", url, err)
+        return False
+    return True
@@ -30,6 +30,16 @@ def auto_enable_custom_integrations(enable_custom_integrations):
     yield
 
 
+@pytest.fixture(autouse=True)
+def mock_keep_alive() -> Generator[None]:
+    """Keep warm-up and keep-alive requests off the network."""
+    with patch(
+        "custom_components.cloudinary_uploader.uploader._ping_upload_api",
+        return_value=True,
+    ) as mock_ping:
+        yield mock_ping
+
+
 @pytest.fixture
 def mock_cloudinary_upload() -> Generator[None]:
     """Mock cloudinary.uploader.upload."""
@@ -0,0 +1,73 @@
+"""Minimal local stand-in for the Cloudinary upload API.
+
+Run as a script; it binds an ephemeral port on 127.0.0.1 and prints it on
+stdout. The response is chosen from the public ID of each upload:
+
+- ``error/...``  returns a Cloudinary-style error payload (HTTP 400).
+- ``slow/...``   stalls for SLOW_SECONDS before answering, to trip timeouts.
+- anything else  returns a successful upload result.
+"""
+
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import sys
+import time
+
+SLOW_SECONDS = 1.0
+
+_PUBLIC_ID = re.compile(rb'name="public_id"\r\n\r\n([^\r]*)\r\n')
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    """Answer upload requests with canned responses."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handle an upload request."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        match = _PUBLIC_ID.search(body)
+        public_id = match.group(1).decode() if match else ""
+
+        if public_id.startswith("slow/"):
+            time.sleep(SLOW_SECONDS)
+
+        if public_id.startswith("error/"):
+            status = 400
+            payload = {"error": {"message": f"Invalid image: {public_id}"}}
+        else:
+            status = 200
+            payload = {
+                "public_id": public_id,
+                "secure_url": f"https://res.cloudinary.com/fake/{public_id}.jpg",
+                "version": 1,
+            }
+
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on a slow request.
+            pass
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        """Silence per-request logging."""
+
+
+def main() -> None:
+    """Serve until killed."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UploadHandler)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,10 +11,16 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
 from custom_components.cloudinary_uploader.const import (
     CONF_API_KEY,
     CONF_API_SECRET,
     CONF_CLOUD_NAME,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_MAX_CONCURRENCY,
+    CONF_MIN_CONCURRENCY,
+    CONF_UPLOAD_TIMEOUT,
     DOMAIN,
 )
 
@@ -116,3 +122,85 @@ async def test_duplicate_entry(
     )
     assert result["type"] == FlowResultType.ABORT
     assert result["reason"] == "already_configured"
+
+
+async def test_options_flow(
+    hass: HomeAssistant,
+) -> None:
+    """Test configuring the default upload timeout."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=MOCK_CONFIG[CONF_CLOUD_NAME],
+        data=MOCK_CONFIG,
+        unique_id=MOCK_CONFIG[CONF_CLOUD_NAME],
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_UPLOAD_TIMEOUT: 20},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_UPLOAD_TIMEOUT] == 20
+
+
+async def test_options_flow_invalid_concurrency_bounds(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a minimum above the maximum concurrency is rejected."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=MOCK_CONFIG[CONF_CLOUD_NAME],
+        data=MOCK_CONFIG,
+        unique_id=MOCK_CONFIG[CONF_CLOUD_NAME],
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_MIN_CONCURRENCY: 6, CONF_MAX_CONCURRENCY: 2},
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_concurrency_bounds"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_MIN_CONCURRENCY: 2, CONF_MAX_CONCURRENCY: 6},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_MIN_CONCURRENCY] == 2
+    assert entry.options[CONF_MAX_CONCURRENCY] == 6
+
+
+@pytest.mark.parametrize(("interval", "valid"), [(0, True), (0.1, False), (10, True)])
+async def test_options_flow_keepalive_interval(
+    hass: HomeAssistant, interval: float, valid: bool
+) -> None:
+    """Test that keep-alive is either disabled or not too frequent."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=MOCK_CONFIG[CONF_CLOUD_NAME],
+        data=MOCK_CONFIG,
+        unique_id=MOCK_CONFIG[CONF_CLOUD_NAME],
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_KEEPALIVE_INTERVAL: interval},
+    )
+
+    if valid:
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert entry.options[CONF_KEEPALIVE_INTERVAL] == interval
+    else:
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {
+            CONF_KEEPALIVE_INTERVAL: "keepalive_interval_too_short"
+        }
@@ -0,0 +1,62 @@
+"""Tests for Cloudinary Uploader diagnostics."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cloudinary_uploader.const import (
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DOMAIN,
+)
+from custom_components.cloudinary_uploader.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .conftest import MOCK_CONFIG
+
+
+async def test_diagnostics(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+) -> None:
+    """Test that diagnostics report connection reuse and redact secrets."""
+    await async_setup_component(hass, "homeassistant", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=MOCK_CONFIG["cloud_name"],
+        data=MOCK_CONFIG,
+        unique_id=MOCK_CONFIG["cloud_name"],
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    await uploader._keeper._task
+
+    # The first upload opens a connection, the second reuses it.
+    with patch(
+        "custom_components.cloudinary_uploader.uploader._connections_opened",
+        side_effect=[0, 1, 1, 1],
+    ):
+        await uploader.async_upload("/tmp/img.jpg", "cold")
+        await uploader.async_upload("/tmp/img.jpg", "warm")
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["cloud_name"] == MOCK_CONFIG["cloud_name"]
+    assert diagnostics["entry"]["data"]["api_key"] == REDACTED
+    assert diagnostics["entry"]["data"]["api_secret"] == REDACTED
+    assert diagnostics["entry"]["data"]["webhook_id"] == REDACTED
+    assert diagnostics["connection"] == {
+        "keepalive_interval": DEFAULT_KEEPALIVE_INTERVAL,
+        "cold_connects": 1,
+        "warm_connects": 1,
+        "keepalive_pings": 1,
+    }
+    assert diagnostics["derived"] == {}
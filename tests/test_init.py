@@ -2,22 +2,42 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.cloudinary_uploader.const import DOMAIN, SERVICE_UPLOAD_IMAGE
+from custom_components.cloudinary_uploader.const import (
+    CONF_KEEPALIVE_INTERVAL,
+    DATA_CONNECTION_KEEPER,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DOMAIN,
+    SERVICE_UPLOAD_IMAGE,
+)
 
 from .conftest import MOCK_CONFIG
 
 
-def _create_entry(hass: HomeAssistant) -> MockConfigEntry:
+def _create_entry(
+    hass: HomeAssistant, options: dict[str, float] | None = None
+) -> MockConfigEntry:
     """Create and add a mock config entry."""
     entry = MockConfigEntry(
         domain=DOMAIN,
         title=MOCK_CONFIG["cloud_name"],
         data=MOCK_CONFIG,
+        options=options or {},
         unique_id=MOCK_CONFIG["cloud_name"],
     )
     entry.add_to_hass(hass)
@@ -35,7 +55,7 @@ async def test_setup_entry(hass: HomeAssistant) -> None:
 
 
 async def test_unload_entry(hass: HomeAssistant) -> None:
-    """Test unloading a config entry removes the service."""
+    """Test unloading a config entry keeps the shared service."""
     entry = _create_entry(hass)
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
@@ -46,4 +66,128 @@ async def test_unload_entry(hass: HomeAssistant) -> None:
     await hass.async_block_till_done()
 
     assert entry.state is ConfigEntryState.NOT_LOADED
-    assert not hass.services.has_service(DOMAIN, SERVICE_UPLOAD_IMAGE)
+    assert hass.services.has_service(DOMAIN, SERVICE_UPLOAD_IMAGE)
+    assert not hass.data[DOMAIN]
+
+
+async def test_failed_unload_keeps_uploader_open(
+    hass: HomeAssistant, mock_cloudinary_upload
+) -> None:
+    """Test that uploads still work if unloading the platforms fails."""
+    entry = _create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    with patch.object(
+        hass.config_entries, "async_unload_platforms", return_value=False
+    ):
+        assert not await hass.config_entries.async_unload(entry.entry_id)
+
+    assert entry.state is ConfigEntryState.LOADED
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    result = await uploader.async_upload("/tmp/img.jpg", "test")
+    assert result["public_id"] == "test_id"
+
+
+async def test_stop_rejects_new_uploads(hass: HomeAssistant) -> None:
+    """Test that uploads are refused once Home Assistant is stopping."""
+    entry = _create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    with pytest.raises(HomeAssistantError, match="shutting down"):
+        await uploader.async_upload("/tmp/img.jpg", "test")
+
+
+async def test_keep_alive(hass: HomeAssistant, mock_keep_alive) -> None:
+    """Test that the connection is warmed on setup and refreshed when idle."""
+    entry = _create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    uploader = hass.data[DOMAIN][entry.entry_id]
+
+    await uploader._keeper._task
+    assert mock_keep_alive.call_count == 1
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DEFAULT_KEEPALIVE_INTERVAL + 1)
+    )
+    await hass.async_block_till_done()
+    await uploader._keeper._task
+
+    assert mock_keep_alive.call_count == 2
+    assert uploader.keepalive_pings == 2
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=3 * DEFAULT_KEEPALIVE_INTERVAL),
+    )
+    await hass.async_block_till_done()
+
+    assert mock_keep_alive.call_count == 2
+
+
+async def test_keep_alive_shared_between_entries(
+    hass: HomeAssistant, mock_keep_alive
+) -> None:
+    """Test that several accounts keep one connection warm with one timer."""
+    entry = _create_entry(hass)
+    mirror = MockConfigEntry(
+        domain=DOMAIN,
+        title="mirror_cloud",
+        data={**MOCK_CONFIG, "cloud_name": "mirror_cloud"},
+        options={CONF_KEEPALIVE_INTERVAL: 20},
+        unique_id="mirror_cloud",
+    )
+    mirror.add_to_hass(hass)
+    # Setting up the integration sets up both entries.
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert mirror.state is ConfigEntryState.LOADED
+    keeper = hass.data[DATA_CONNECTION_KEEPER]
+
+    await keeper._task
+    assert mock_keep_alive.call_count == 1
+
+    # The shortest interval wins.
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=21))
+    await hass.async_block_till_done()
+    await keeper._task
+    assert mock_keep_alive.call_count == 2
+
+    await hass.config_entries.async_unload(mirror.entry_id)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=42))
+    await hass.async_block_till_done()
+    assert mock_keep_alive.call_count == 2
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DEFAULT_KEEPALIVE_INTERVAL + 22)
+    )
+    await hass.async_block_till_done()
+    await keeper._task
+    assert mock_keep_alive.call_count == 3
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert DATA_CONNECTION_KEEPER not in hass.data
+
+
+async def test_keep_alive_disabled(hass: HomeAssistant, mock_keep_alive) -> None:
+    """Test that a keep-alive interval of 0 disables warm-up."""
+    entry = _create_entry(hass, {CONF_KEEPALIVE_INTERVAL: 0})
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DEFAULT_KEEPALIVE_INTERVAL + 1)
+    )
+    await hass.async_block_till_done()
+
+    mock_keep_alive.assert_not_called()
@@ -0,0 +1,122 @@
+"""Tests for the adaptive upload concurrency limit."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from custom_components.cloudinary_uploader.limiter import (
+    AdaptiveConcurrencyLimiter,
+)
+
+
+async def _run_uploads(
+    limiter: AdaptiveConcurrencyLimiter, count: int, latency: float
+) -> None:
+    """Run successful uploads that all compete for slots at once."""
+
+    async def upload() -> None:
+        started = await limiter.async_acquire()
+        await asyncio.sleep(0)
+        limiter.release(started, latency=latency)
+
+    await asyncio.gather(*(upload() for _ in range(count)))
+
+
+async def test_additive_increase() -> None:
+    """Test that the limit grows while uploads queue for slots."""
+    limiter = AdaptiveConcurrencyLimiter(1, 8, 2)
+
+    await _run_uploads(limiter, 4, 1.0)
+    assert limiter.current_limit == 3
+
+    await _run_uploads(limiter, 100, 1.0)
+    assert limiter.current_limit == 8
+
+
+async def test_no_increase_when_idle() -> None:
+    """Test that the limit does not grow when it is not the bottleneck."""
+    limiter = AdaptiveConcurrencyLimiter(1, 8, 4)
+
+    for _ in range(20):
+        limiter.release(await limiter.async_acquire(), latency=1.0)
+
+    assert limiter.current_limit == 4
+
+
+async def test_multiplicative_decrease_once_per_round() -> None:
+    """Test that concurrent failures only halve the limit once."""
+    limiter = AdaptiveConcurrencyLimiter(1, 16, 8)
+    started = [await limiter.async_acquire() for _ in range(8)]
+
+    for start in started:
+        limiter.release(start, congested=True)
+    assert limiter.current_limit == 4
+
+    limiter.release(await limiter.async_acquire(), congested=True)
+    assert limiter.current_limit == 2
+
+
+async def test_decrease_clamped_to_minimum() -> None:
+    """Test that the limit never drops below the configured minimum."""
+    limiter = AdaptiveConcurrencyLimiter(2, 8, 4)
+
+    for _ in range(5):
+        limiter.release(await limiter.async_acquire(), congested=True)
+
+    assert limiter.current_limit == 2
+
+
+async def test_slow_upload_backs_off() -> None:
+    """Test that latency well above the baseline lowers the limit."""
+    limiter = AdaptiveConcurrencyLimiter(1, 16, 10)
+    limiter.release(await limiter.async_acquire(), latency=1.0)
+
+    limiter.release(await limiter.async_acquire(), latency=5.0)
+
+    assert limiter.current_limit == 9
+
+
+async def test_waiters_get_freed_slots() -> None:
+    """Test that uploads beyond the limit wait for a free slot."""
+    limiter = AdaptiveConcurrencyLimiter(1, 1, 1)
+    first = await limiter.async_acquire()
+
+    waiter = asyncio.ensure_future(limiter.async_acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release(first)
+    await waiter
+    assert limiter.in_flight == 1
+
+
+async def test_cancelled_waiter_releases_nothing() -> None:
+    """Test that a cancelled waiter does not leak a slot."""
+    limiter = AdaptiveConcurrencyLimiter(1, 1, 1)
+    first = await limiter.async_acquire()
+
+    waiter = asyncio.ensure_future(limiter.async_acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+
+    limiter.release(first)
+    assert limiter.in_flight == 0
+
+
+async def test_listener_called_on_change() -> None:
+    """Test that listeners hear about limit changes only."""
+    limiter = AdaptiveConcurrencyLimiter(1, 8, 4)
+    listener = MagicMock()
+    remove = limiter.async_add_listener(listener)
+
+    limiter.release(await limiter.async_acquire(), latency=1.0)
+    listener.assert_not_called()
+
+    limiter.release(await limiter.async_acquire(), congested=True)
+    listener.assert_called_once()
+
+    remove()
+    limiter.release(await limiter.async_acquire(), congested=True)
+    listener.assert_called_once()
@@ -0,0 +1,45 @@
+"""Tests for the Cloudinary Uploader sensor."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.cloudinary_uploader.const import (
+    CONF_MAX_CONCURRENCY,
+    CONF_MIN_CONCURRENCY,
+    DOMAIN,
+)
+
+from .test_service import _setup_integration
+
+ENTITY_ID = "sensor.test_cloud_upload_concurrency_limit"
+
+
+async def test_concurrency_limit_sensor(hass: HomeAssistant) -> None:
+    """Test that the sensor follows the adaptive concurrency limit."""
+    entry = await _setup_integration(
+        hass, {CONF_MIN_CONCURRENCY: 1, CONF_MAX_CONCURRENCY: 8}
+    )
+
+    state = hass.states.get(ENTITY_ID)
+    assert state.state == "4"
+    assert state.attributes["min_limit"] == 1
+    assert state.attributes["max_limit"] == 8
+
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    with (
+        patch(
+            "cloudinary.uploader.upload",
+            return_value={"error": {"message": "Rate limited", "http_code": 429}},
+        ),
+        pytest.raises(HomeAssistantError, match="Rate limited"),
+    ):
+        await uploader.async_upload("/tmp/img.jpg", "test")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(ENTITY_ID).state == "2"
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 from unittest.mock import patch
 
 import cloudinary.exceptions
@@ -14,8 +16,15 @@ from homeassistant.setup import async_setup_component
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.cloudinary_uploader.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DESTINATIONS,
     ATTR_FILE_PATH,
     ATTR_PUBLIC_ID,
+    ATTR_TIMEOUT,
+    CONF_MAX_CONCURRENCY,
+    CONF_MIN_CONCURRENCY,
+    CONF_UPLOAD_TIMEOUT,
+    DEFAULT_UPLOAD_TIMEOUT,
     DOMAIN,
     SERVICE_UPLOAD_IMAGE,
 )
@@ -23,24 +32,46 @@ from custom_components.cloudinary_uploader.const import (
 from .conftest import MOCK_CONFIG
 
 
-def _create_entry(hass: HomeAssistant) -> MockConfigEntry:
+def _create_entry(
+    hass: HomeAssistant,
+    config: dict[str, str] = MOCK_CONFIG,
+    options: dict[str, float] | None = None,
+) -> MockConfigEntry:
     """Create and add a mock config entry."""
     entry = MockConfigEntry(
         domain=DOMAIN,
-        title=MOCK_CONFIG["cloud_name"],
-        data=MOCK_CONFIG,
-        unique_id=MOCK_CONFIG["cloud_name"],
+        title=config["cloud_name"],
+        data=config,
+        options=options or {},
+        unique_id=config["cloud_name"],
     )
     entry.add_to_hass(hass)
     return entry
 
 
-async def _setup_integration(hass: HomeAssistant) -> None:
+async def _setup_integration(
+    hass: HomeAssistant, options: dict[str, float] | None = None
+) -> MockConfigEntry:
     """Set up the integration with a mock config entry."""
     await async_setup_component(hass, "homeassistant", {})
-    entry = _create_entry(hass)
+    entry = _create_entry(hass, options=options)
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
+    return entry
+
+
+def _blocking_upload(
+    release: threading.Event, started: threading.Event | None = None
+):
+    """Return an upload side effect that blocks until released."""
+
+    def _upload(*args, **kwargs):
+        if started is not None:
+            started.set()
+        release.wait(5)
+        return {"public_id": kwargs["public_id"], "secure_url": "https://x"}
+
+    return _upload
 
 
 async def test_upload_image_success(
@@ -64,16 +95,18 @@ async def test_upload_image_success(
             blocking=True,
         )
 
-    mock_cloudinary_config.assert_called_once_with(
-        cloud_name=MOCK_CONFIG["cloud_name"],
-        api_key=MOCK_CONFIG["api_key"],
-        api_secret=MOCK_CONFIG["api_secret"],
-    )
+    # Credentials are passed per call, not through the global config.
+    mock_cloudinary_config.assert_not_called()
     mock_cloudinary_upload.assert_called_once_with(
         test_file,
         public_id="my_camera/snapshot",
         overwrite=True,
         resource_type="image",
+        timeout=pytest.approx(DEFAULT_UPLOAD_TIMEOUT, abs=1),
+        cloud_name=MOCK_CONFIG["cloud_name"],
+        api_key=MOCK_CONFIG["api_key"],
+        api_secret=MOCK_CONFIG["api_secret"],
+        return_error=True,
     )
 
 
@@ -204,3 +237,383 @@ async def test_upload_passes_overwrite_flag(
     _, kwargs = mock_cloudinary_upload.call_args
     assert kwargs["overwrite"] is True
     assert kwargs["public_id"] == "same_id"
+
+
+async def test_upload_per_call_timeout(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+    mock_cloudinary_config,
+) -> None:
+    """Test that a per-call timeout overrides the default."""
+    await _setup_integration(hass)
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("os.path.isfile", return_value=True),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: "/tmp/img.jpg",
+                ATTR_PUBLIC_ID: "test",
+                ATTR_TIMEOUT: 15,
+            },
+            blocking=True,
+        )
+
+    _, kwargs = mock_cloudinary_upload.call_args
+    assert kwargs["timeout"] == pytest.approx(15, abs=1)
+
+
+async def test_upload_timeout(
+    hass: HomeAssistant,
+    mock_cloudinary_config,
+) -> None:
+    """Test that a hung upload is abandoned once the timeout expires."""
+    entry = await _setup_integration(hass)
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    release = threading.Event()
+
+    try:
+        with (
+            patch(
+                "cloudinary.uploader.upload",
+                side_effect=_blocking_upload(release),
+            ),
+            pytest.raises(HomeAssistantError, match="timed out"),
+        ):
+            await uploader.async_upload("/tmp/hung.jpg", "test", timeout=0.05)
+    finally:
+        release.set()
+
+
+async def test_unload_waits_for_in_flight_upload(
+    hass: HomeAssistant,
+    mock_cloudinary_config,
+) -> None:
+    """Test that unloading lets an in-flight upload finish."""
+    entry = await _setup_integration(hass)
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    release = threading.Event()
+    started = threading.Event()
+
+    with patch(
+        "cloudinary.uploader.upload",
+        side_effect=_blocking_upload(release, started),
+    ):
+        upload_task = hass.async_create_task(
+            uploader.async_upload("/tmp/img.jpg", "test")
+        )
+        await hass.async_add_executor_job(started.wait, 5)
+        unload_task = hass.async_create_task(
+            hass.config_entries.async_unload(entry.entry_id)
+        )
+        await asyncio.sleep(0)
+        assert not unload_task.done()
+
+        release.set()
+        assert await unload_task
+        result = await upload_task
+
+    assert result["public_id"] == "test"
+
+
+async def test_unload_aborts_uploads_after_deadline(
+    hass: HomeAssistant,
+    mock_cloudinary_config,
+) -> None:
+    """Test that uploads still running after the drain deadline are aborted."""
+    entry = await _setup_integration(hass)
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    release = threading.Event()
+    started = threading.Event()
+
+    try:
+        with (
+            patch(
+                "custom_components.cloudinary_uploader.DRAIN_TIMEOUT", 0.05
+            ),
+            patch(
+                "cloudinary.uploader.upload",
+                side_effect=_blocking_upload(release, started),
+            ),
+        ):
+            upload_task = hass.async_create_task(
+                uploader.async_upload("/tmp/img.jpg", "test")
+            )
+            await hass.async_add_executor_job(started.wait, 5)
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+            with pytest.raises(HomeAssistantError, match="aborted"):
+                await upload_task
+            with pytest.raises(HomeAssistantError, match="shutting down"):
+                await uploader.async_upload("/tmp/img.jpg", "test")
+    finally:
+        release.set()
+
+
+async def test_upload_to_multiple_destinations(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+    tmp_path,
+) -> None:
+    """Test that a file is read once and uploaded to every destination."""
+    entry = await _setup_integration(hass)
+    mirror = _create_entry(
+        hass, {**MOCK_CONFIG, "cloud_name": "mirror_cloud", "api_key": "mirror"}
+    )
+    await hass.config_entries.async_setup(mirror.entry_id)
+    await hass.async_block_till_done()
+
+    test_file = tmp_path / "snapshot.jpg"
+    test_file.write_bytes(b"image-bytes")
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch(
+            "pathlib.Path.read_bytes",
+            autospec=True,
+            return_value=b"image-bytes",
+        ) as mock_read,
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: str(test_file),
+                ATTR_DESTINATIONS: [
+                    {ATTR_CONFIG_ENTRY_ID: entry.entry_id, ATTR_PUBLIC_ID: "a"},
+                    {ATTR_CONFIG_ENTRY_ID: entry.entry_id, ATTR_PUBLIC_ID: "b"},
+                    {ATTR_CONFIG_ENTRY_ID: mirror.entry_id, ATTR_PUBLIC_ID: "a"},
+                ],
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    mock_read.assert_called_once()
+    assert mock_cloudinary_upload.call_count == 3
+    uploads = sorted(
+        (call.kwargs["cloud_name"], call.kwargs["public_id"])
+        for call in mock_cloudinary_upload.call_args_list
+    )
+    assert uploads == [
+        ("mirror_cloud", "a"),
+        ("test_cloud", "a"),
+        ("test_cloud", "b"),
+    ]
+    for call in mock_cloudinary_upload.call_args_list:
+        assert call.args[0] == (str(test_file), b"image-bytes")
+    assert [result[ATTR_PUBLIC_ID] for result in response["results"]] == [
+        "a",
+        "b",
+        "a",
+    ]
+    assert all("secure_url" in result for result in response["results"])
+
+
+async def test_upload_to_destinations_partial_failure(
+    hass: HomeAssistant,
+    tmp_path,
+) -> None:
+    """Test that a failing destination does not fail the others."""
+    await _setup_integration(hass)
+    test_file = tmp_path / "snapshot.jpg"
+    test_file.write_bytes(b"image-bytes")
+
+    def _upload(file, **kwargs):
+        if kwargs["public_id"] == "bad":
+            raise cloudinary.exceptions.Error("Invalid public id")
+        return {"public_id": kwargs["public_id"], "secure_url": "https://x"}
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("cloudinary.uploader.upload", side_effect=_upload),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: str(test_file),
+                ATTR_DESTINATIONS: [
+                    {ATTR_PUBLIC_ID: "good"},
+                    {ATTR_PUBLIC_ID: "bad"},
+                ],
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    good, bad = response["results"]
+    assert good["secure_url"] == "https://x"
+    assert "Invalid public id" in bad["error"]
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("cloudinary.uploader.upload", side_effect=_upload),
+        pytest.raises(HomeAssistantError, match="failed for all 1 destinations"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: str(test_file),
+                ATTR_DESTINATIONS: [{ATTR_PUBLIC_ID: "bad"}],
+            },
+            blocking=True,
+        )
+
+
+async def test_upload_to_unknown_entry(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+) -> None:
+    """Test that an unloaded destination entry is rejected."""
+    await _setup_integration(hass)
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("os.path.isfile", return_value=True),
+        pytest.raises(ServiceValidationError, match="not loaded"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: "/tmp/img.jpg",
+                ATTR_DESTINATIONS: [
+                    {ATTR_CONFIG_ENTRY_ID: "missing", ATTR_PUBLIC_ID: "a"}
+                ],
+            },
+            blocking=True,
+        )
+
+    mock_cloudinary_upload.assert_not_called()
+
+
+async def test_upload_with_several_accounts(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+) -> None:
+    """Test that the account must be chosen once a mirror entry is loaded."""
+    entry = await _setup_integration(hass)
+    mirror = _create_entry(
+        hass, {**MOCK_CONFIG, "cloud_name": "mirror_cloud", "api_key": "mirror"}
+    )
+    await hass.config_entries.async_setup(mirror.entry_id)
+    await hass.async_block_till_done()
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("os.path.isfile", return_value=True),
+    ):
+        with pytest.raises(ServiceValidationError, match="config_entry_id"):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_UPLOAD_IMAGE,
+                {ATTR_FILE_PATH: "/tmp/img.jpg", ATTR_PUBLIC_ID: "a"},
+                blocking=True,
+            )
+        mock_cloudinary_upload.assert_not_called()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: "/tmp/img.jpg",
+                ATTR_CONFIG_ENTRY_ID: mirror.entry_id,
+                ATTR_PUBLIC_ID: "a",
+            },
+            blocking=True,
+            return_response=True,
+        )
+        assert mock_cloudinary_upload.call_args.kwargs["cloud_name"] == (
+            "mirror_cloud"
+        )
+        assert response["results"][0][ATTR_CONFIG_ENTRY_ID] == mirror.entry_id
+
+        # Unloading the mirror leaves the service working for the other
+        # account, which becomes the default again.
+        await hass.config_entries.async_unload(mirror.entry_id)
+        await hass.async_block_till_done()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {ATTR_FILE_PATH: "/tmp/img.jpg", ATTR_PUBLIC_ID: "b"},
+            blocking=True,
+            return_response=True,
+        )
+        assert mock_cloudinary_upload.call_args.kwargs["cloud_name"] == (
+            "test_cloud"
+        )
+        assert response["results"][0][ATTR_CONFIG_ENTRY_ID] == entry.entry_id
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        with pytest.raises(ServiceValidationError, match="No Cloudinary account"):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_UPLOAD_IMAGE,
+                {ATTR_FILE_PATH: "/tmp/img.jpg", ATTR_PUBLIC_ID: "c"},
+                blocking=True,
+            )
+
+
+@pytest.mark.parametrize(
+    ("http_code", "limit"),
+    [(400, 4), (404, 4), (429, 2), (500, 2), (503, 2)],
+)
+async def test_upload_error_adjusts_limit(
+    hass: HomeAssistant, http_code: int, limit: int
+) -> None:
+    """Test that throttling and server errors lower the limit, others do not."""
+    entry = await _setup_integration(hass)
+    uploader = hass.data[DOMAIN][entry.entry_id]
+
+    with (
+        patch(
+            "cloudinary.uploader.upload",
+            return_value={"error": {"message": "Failed", "http_code": http_code}},
+        ),
+        pytest.raises(HomeAssistantError, match="Failed"),
+    ):
+        await uploader.async_upload("/tmp/img.jpg", "test")
+
+    assert uploader.limiter.current_limit == limit
+
+
+async def test_queue_wait_shortens_socket_timeout(hass: HomeAssistant) -> None:
+    """Test that the SDK only gets the timeout left after waiting for a slot."""
+    entry = await _setup_integration(
+        hass,
+        {CONF_UPLOAD_TIMEOUT: 5, CONF_MIN_CONCURRENCY: 1, CONF_MAX_CONCURRENCY: 1},
+    )
+    uploader = hass.data[DOMAIN][entry.entry_id]
+
+    started = threading.Event()
+    release = threading.Event()
+    timeouts: dict[str, float] = {}
+
+    def _upload(file, **kwargs):
+        timeouts[kwargs["public_id"]] = kwargs["timeout"]
+        if kwargs["public_id"] == "first":
+            started.set()
+            release.wait(5)
+        return {"public_id": kwargs["public_id"], "secure_url": "https://x"}
+
+    with patch("cloudinary.uploader.upload", side_effect=_upload):
+        first = hass.async_create_task(uploader.async_upload("/tmp/a.jpg", "first"))
+        await hass.async_add_executor_job(started.wait, 5)
+        second = hass.async_create_task(
+            uploader.async_upload("/tmp/b.jpg", "second")
+        )
+        await asyncio.sleep(1)
+        release.set()
+        await first
+        await second
+
+    assert timeouts["first"] == pytest.approx(5, abs=0.5)
+    assert timeouts["second"] <= 4
@@ -0,0 +1,228 @@
+"""Soak test for resource leaks in the upload path.
+
+Drives many upload_image calls against a local fake Cloudinary endpoint,
+mixing successes, API errors, timeouts and entry reloads, and fails if RSS,
+traced Python memory, open file descriptors or threads grow past a budget.
+
+The default run is short so it fits in the normal test suite. For a real
+soak, raise the iteration count and lift the per-test timeout:
+
+    SOAK_ITERATIONS=20000 pytest tests/test_soak.py --timeout=0
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Generator
+import gc
+import logging
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import tracemalloc
+from unittest.mock import patch
+
+import cloudinary
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.cloudinary_uploader.const import (
+    ATTR_FILE_PATH,
+    ATTR_PUBLIC_ID,
+    CONF_UPLOAD_TIMEOUT,
+    DOMAIN,
+    SERVICE_UPLOAD_IMAGE,
+)
+
+from .conftest import MOCK_CONFIG
+
+SOAK_ITERATIONS = int(os.environ.get("SOAK_ITERATIONS", "300"))
+CONCURRENCY = 16
+RELOAD_EVERY = 10  # batches
+UPLOAD_TIMEOUT = 0.25
+
+# Allowed growth between the end of warm-up and the end of the run.
+RSS_BUDGET = 16 * 1024 * 1024
+TRACEMALLOC_BUDGET = 1024 * 1024
+FD_BUDGET = 8
+THREAD_BUDGET = 4
+
+
+@pytest.fixture
+def fake_endpoint() -> Generator[str]:
+    """Run the fake Cloudinary API in a subprocess and point the SDK at it.
+
+    A separate process keeps the server's own threads, sockets and memory
+    out of the measurements.
+    """
+    server = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("fake_cloudinary.py"))],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        port = int(server.stdout.readline())
+        prefix = f"http://127.0.0.1:{port}"
+        with patch.object(cloudinary.config(), "upload_prefix", prefix):
+            yield prefix
+    finally:
+        server.kill()
+        server.wait()
+        server.stdout.close()
+
+
+def _usage() -> dict[str, int]:
+    """Return the current resource usage of this process."""
+    gc.collect()
+    return {
+        "rss": _rss_bytes(),
+        "traced": tracemalloc.get_traced_memory()[0],
+        "fds": len(os.listdir("/proc/self/fd")),
+        "threads": threading.active_count(),
+    }
+
+
+def _rss_bytes() -> int:
+    """Return the resident set size of this process."""
+    with open("/proc/self/statm", encoding="ascii") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _kind(index: int) -> str:
+    """Pick the behaviour of the fake endpoint for an upload."""
+    if index % 100 == 0:
+        return "slow"
+    if index % 10 == 0:
+        return "error"
+    return "ok"
+
+
+async def _upload(hass: HomeAssistant, file_path: str, index: int) -> str:
+    """Call the service once and classify the outcome."""
+    kind = _kind(index)
+    try:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {ATTR_FILE_PATH: file_path, ATTR_PUBLIC_ID: f"{kind}/{index}"},
+            blocking=True,
+        )
+    except HomeAssistantError as err:
+        if err.translation_key == "upload_timeout":
+            return "timeout"
+        if str(err).startswith("Cloudinary upload failed"):
+            return "error"
+        # Raced with a reload: drained by the old entry, or sent while no
+        # entry was loaded.
+        if err.translation_key in ("upload_aborted", "no_entry_loaded"):
+            return "aborted"
+        raise
+    return "ok"
+
+
+async def _run(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    file_path: str,
+    start: int,
+    stop: int,
+    outcomes: Counter[str],
+) -> int:
+    """Run uploads in concurrent batches, reloading the entry periodically.
+
+    Returns the number of reloads.
+    """
+    reloads = 0
+    for batch, first in enumerate(range(start, stop, CONCURRENCY)):
+        calls = [
+            _upload(hass, file_path, index)
+            for index in range(first, min(first + CONCURRENCY, stop))
+        ]
+        if batch % RELOAD_EVERY == RELOAD_EVERY - 1:
+            # Reload while uploads are in flight to exercise the drain.
+            results = await asyncio.gather(
+                *calls, hass.config_entries.async_reload(entry.entry_id)
+            )
+            outcomes.update(results[:-1])
+            reloads += 1
+        else:
+            results = await asyncio.gather(*calls)
+            assert "aborted" not in results, "Upload aborted without a reload"
+            outcomes.update(results)
+    return reloads
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/fd"), reason="Requires Linux /proc"
+)
+async def test_upload_soak(
+    hass: HomeAssistant,
+    socket_enabled: None,
+    fake_endpoint: str,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that sustained uploads do not leak memory, FDs or threads."""
+    # Captured log records and mock call history would otherwise show up as
+    # growth.
+    caplog.set_level(logging.ERROR)
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    await async_setup_component(hass, "homeassistant", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=MOCK_CONFIG["cloud_name"],
+        data=MOCK_CONFIG,
+        options={CONF_UPLOAD_TIMEOUT: UPLOAD_TIMEOUT},
+        unique_id=MOCK_CONFIG["cloud_name"],
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    snapshot = tmp_path / "snapshot.jpg"
+    snapshot.write_bytes(os.urandom(16 * 1024))
+    warmup = max(SOAK_ITERATIONS // 5, CONCURRENCY * RELOAD_EVERY)
+    outcomes: Counter[str] = Counter()
+
+    tracemalloc.start()
+    try:
+        reloads = await _run(hass, entry, str(snapshot), 0, warmup, outcomes)
+        before_snapshot = tracemalloc.take_snapshot()
+        before = _usage()
+
+        reloads += await _run(
+            hass, entry, str(snapshot), warmup, warmup + SOAK_ITERATIONS, outcomes
+        )
+        # Let abandoned executor jobs hit their socket timeout.
+        await asyncio.sleep(UPLOAD_TIMEOUT * 4)
+        after = _usage()
+        after_snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    assert outcomes["ok"] > 0
+    assert outcomes["error"] > 0
+    assert outcomes["timeout"] > 0
+    # Only uploads racing a reload may be aborted.
+    assert outcomes["aborted"] <= reloads * CONCURRENCY
+    assert sum(outcomes.values()) == warmup + SOAK_ITERATIONS
+
+    growth = {key: after[key] - before[key] for key in before}
+    top = "\n".join(
+        str(stat)
+        for stat in after_snapshot.compare_to(before_snapshot, "lineno")[:10]
+    )
+    assert growth["rss"] <= RSS_BUDGET, f"RSS grew {growth['rss']} bytes"
+    assert (
+        growth["traced"] <= TRACEMALLOC_BUDGET
+    ), f"Traced memory grew {growth['traced']} bytes; top growth:\n{top}"
+    assert growth["fds"] <= FD_BUDGET, f"Open FDs grew by {growth['fds']}"
+    assert growth["threads"] <= THREAD_BUDGET, f"Threads grew by {growth['threads']}"
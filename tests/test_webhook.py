@@ -0,0 +1,253 @@
+"""Tests for eager transformations and the Cloudinary notification webhook."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import json
+import time
+from unittest.mock import patch
+
+import cloudinary.utils
+import pytest
+
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.cloudinary_uploader.const import (
+    ATTR_EAGER,
+    ATTR_FILE_PATH,
+    ATTR_PUBLIC_ID,
+    DOMAIN,
+    EVENT_EAGER_COMPLETE,
+    SERVICE_UPLOAD_IMAGE,
+)
+
+from custom_components.cloudinary_uploader.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .conftest import MOCK_CONFIG
+
+EAGER_NOTIFICATION = {
+    "notification_type": "eager",
+    "public_id": "home_camera/front_door",
+    "batch_id": "abc123",
+    "eager": [
+        {
+            "transformation": "c_thumb,h_200,w_200",
+            "width": 200,
+            "height": 200,
+            "url": "http://res.cloudinary.com/test_cloud/thumb.jpg",
+            "secure_url": "https://res.cloudinary.com/test_cloud/thumb.jpg",
+        }
+    ],
+}
+
+
+async def _setup_integration(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up the integration with a mock config entry."""
+    await async_setup_component(hass, "homeassistant", {})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=MOCK_CONFIG["cloud_name"],
+        data=MOCK_CONFIG,
+        unique_id=MOCK_CONFIG["cloud_name"],
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _signed_headers(body: str, timestamp: int | None = None) -> dict[str, str]:
+    """Sign a notification body the way Cloudinary does."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    return {
+        "X-Cld-Timestamp": str(timestamp),
+        "X-Cld-Signature": cloudinary.utils.compute_hex_hash(
+            f"{body}{timestamp}{MOCK_CONFIG['api_secret']}"
+        ),
+    }
+
+
+async def test_webhook_id_generated(hass: HomeAssistant) -> None:
+    """Test that a webhook ID is created for the entry on first setup."""
+    entry = await _setup_integration(hass)
+
+    assert entry.data[CONF_WEBHOOK_ID]
+
+
+async def test_upload_with_eager_transformations(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+) -> None:
+    """Test that eager transformations are requested asynchronously."""
+    entry = await _setup_integration(hass)
+    hass.config.external_url = "https://example.com"
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("os.path.isfile", return_value=True),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: "/tmp/img.jpg",
+                ATTR_PUBLIC_ID: "home_camera/front_door",
+                ATTR_EAGER: ["c_thumb,w_200,h_200", "q_auto/webp"],
+            },
+            blocking=True,
+        )
+
+    _, kwargs = mock_cloudinary_upload.call_args
+    assert kwargs["eager"] == ["c_thumb,w_200,h_200", "q_auto/webp"]
+    assert kwargs["eager_async"] is True
+    assert kwargs["eager_notification_url"] == (
+        f"https://example.com/api/webhook/{entry.data[CONF_WEBHOOK_ID]}"
+    )
+
+
+async def test_upload_with_eager_needs_url(
+    hass: HomeAssistant,
+    mock_cloudinary_upload,
+) -> None:
+    """Test that eager transformations are refused with only a LAN URL."""
+    await _setup_integration(hass)
+    hass.config.internal_url = "http://192.168.1.2:8123"
+
+    with (
+        patch.object(hass.config, "is_allowed_path", return_value=True),
+        patch("os.path.isfile", return_value=True),
+        pytest.raises(ServiceValidationError, match="external URL"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_UPLOAD_IMAGE,
+            {
+                ATTR_FILE_PATH: "/tmp/img.jpg",
+                ATTR_PUBLIC_ID: "test",
+                ATTR_EAGER: ["q_auto/webp"],
+            },
+            blocking=True,
+        )
+
+    mock_cloudinary_upload.assert_not_called()
+
+
+async def test_eager_notification(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+) -> None:
+    """Test that a signed eager notification fires an event."""
+    entry = await _setup_integration(hass)
+    events = async_capture_events(hass, EVENT_EAGER_COMPLETE)
+    client = await hass_client_no_auth()
+    body = json.dumps(EAGER_NOTIFICATION)
+
+    response = await client.post(
+        f"/api/webhook/{entry.data[CONF_WEBHOOK_ID]}",
+        data=body,
+        headers=_signed_headers(body),
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == HTTPStatus.OK
+    assert len(events) == 1
+    assert events[0].data == {
+        "config_entry_id": entry.entry_id,
+        "public_id": "home_camera/front_door",
+        "derived": [
+            {
+                "transformation": "c_thumb,h_200,w_200",
+                "secure_url": "https://res.cloudinary.com/test_cloud/thumb.jpg",
+                "width": 200,
+                "height": 200,
+            }
+        ],
+    }
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["derived"] == {
+        "home_camera/front_door": events[0].data["derived"]
+    }
+
+
+async def test_derived_history_is_bounded(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+) -> None:
+    """Test that only the most recently notified public IDs are kept."""
+    entry = await _setup_integration(hass)
+    client = await hass_client_no_auth()
+
+    with patch(
+        "custom_components.cloudinary_uploader.uploader.DERIVED_HISTORY_SIZE", 2
+    ):
+        for public_id in ("first", "second", "first", "third"):
+            body = json.dumps({**EAGER_NOTIFICATION, "public_id": public_id})
+            response = await client.post(
+                f"/api/webhook/{entry.data[CONF_WEBHOOK_ID]}",
+                data=body,
+                headers=_signed_headers(body),
+            )
+            assert response.status == HTTPStatus.OK
+
+    # "second" is dropped: the repeat notification made "first" recent again.
+    uploader = hass.data[DOMAIN][entry.entry_id]
+    assert list(uploader.derived) == ["first", "third"]
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"X-Cld-Timestamp": str(int(time.time())), "X-Cld-Signature": "bad"},
+    ],
+)
+async def test_eager_notification_bad_signature(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+    headers: dict[str, str],
+) -> None:
+    """Test that unsigned or forged notifications are rejected."""
+    entry = await _setup_integration(hass)
+    events = async_capture_events(hass, EVENT_EAGER_COMPLETE)
+    client = await hass_client_no_auth()
+
+    response = await client.post(
+        f"/api/webhook/{entry.data[CONF_WEBHOOK_ID]}",
+        data=json.dumps(EAGER_NOTIFICATION),
+        headers=headers,
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == HTTPStatus.UNAUTHORIZED
+    assert not events
+
+
+async def test_eager_notification_expired(
+    hass: HomeAssistant,
+    hass_client_no_auth,
+) -> None:
+    """Test that replayed old notifications are rejected."""
+    entry = await _setup_integration(hass)
+    events = async_capture_events(hass, EVENT_EAGER_COMPLETE)
+    client = await hass_client_no_auth()
+    body = json.dumps(EAGER_NOTIFICATION)
+
+    response = await client.post(
+        f"/api/webhook/{entry.data[CONF_WEBHOOK_ID]}",
+        data=body,
+        headers=_signed_headers(body, int(time.time()) - 3 * 3600),
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == HTTPStatus.UNAUTHORIZED
+    assert not events